@@ -4,9 +4,11 @@ and get click arguments to parse.
 """
 
 import abc
+import copy
 import dataclasses
 import functools
 import logging
+import weakref
 from inspect import isclass
 from typing import (
     Any,
@@ -15,27 +17,44 @@ from typing import (
     Dict,
     Iterable,
     List,
+    NamedTuple,
+    TYPE_CHECKING,
     Optional,
     Tuple,
     Union,
-    get_type_hints,
     overload,
 )
 
-import click
-from typing_extensions import Literal, Protocol, Type, TypeVar, get_args, get_origin
+from typing_extensions import (
+    Literal,
+    Protocol,
+    Type,
+    TypeVar,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
 
 try:
     from typing import NoneType  # pyright: ignore
 except ImportError:
     NoneType = type(None)
 
+if TYPE_CHECKING:
+    import click
+
 T = TypeVar("T")
 
 ###############################################################################
 
 log = logging.getLogger(__name__)
-ClickFunction = Literal[click.option, click.argument]
+
+# Importing click takes a noticeable time, so it is imported on first use.
+# Annotations referring to click are strings for the same reason.
+if TYPE_CHECKING:
+    ClickFunction = Literal[click.option, click.argument]
+else:
+    ClickFunction = Callable
 
 
 class DataclassInstance(Protocol):
@@ -49,33 +68,43 @@ def is_type(orig: Type, types: Iterable[Type]) -> bool:
     return any(type(orig) is type(x) for x in types)
 
 
+_TypeKind = Literal["optional", "tuple_arr", "list", "scalar"]
+
+
+def _classify_type(orig: Type) -> _TypeKind:
+    """Classify type as Optional[T], Tuple[T, ...], List[T] or any other type"""
+    origin = get_origin(orig)
+    if origin is None:
+        return "scalar"
+    args = get_args(orig)
+    if origin is Union and len(args) == 2 and args[1] is NoneType:
+        return "optional"
+    if origin in (Tuple, tuple) and len(args) == 2 and args[1] is Ellipsis:
+        return "tuple_arr"
+    if origin in (List, list) and len(args) == 1:
+        return "list"
+    return "scalar"
+
+
 def is_optional(orig: Type) -> bool:
     """Check if type is Optional[T]"""
-    return (
-        get_origin(orig) is Union
-        and len(get_args(orig)) == 2
-        and get_args(orig)[1] is NoneType
-    )
+    return _classify_type(orig) == "optional"
 
 
 def is_tuple_arr(orig: Type) -> bool:
     """Check if type is Tuple[T, ...]"""
-    return (
-        get_origin(orig) in [Tuple, tuple]
-        and len(get_args(orig)) == 2
-        and get_args(orig)[1] is Ellipsis
-    )
+    return _classify_type(orig) == "tuple_arr"
 
 
 def is_list(orig: Type) -> bool:
     """Check if type is List[T]"""
-    return get_origin(orig) in [List, list] and len(get_args(orig)) == 1
+    return _classify_type(orig) == "list"
 
 
 ###############################################################################
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class Opts:
     """The options of clickdc module. Not implemented. Make an issue to ping me."""
 
@@ -96,12 +125,20 @@ class Opts:
 
     def __post_init__(self):
         if self.no:
-            self.arg = self.check = self.infer = False
+            for name in ("arg", "check", "infer"):
+                object.__setattr__(self, name, False)
+
+
+# Opts is frozen, so the common instances are created once and shared.
+_OPTS_DEFAULT = Opts()
+_OPTS_NO = Opts(no=True)
 
 
-@dataclasses.dataclass(frozen=True)
 class FieldDesc:
-    """Additional data put with the field in metadata"""
+    """Additional data put with the field in metadata.
+    Plain class with __slots__, it is cheaper to create than a frozen dataclass."""
+
+    __slots__ = ("callback", "opts", "args", "kwargs")
 
     callback: ClickFunction
     """click.option or click.argument"""
@@ -115,29 +152,120 @@ class FieldDesc:
     kwargs: Dict[str, Any]
     """Dictionary argumetns to callback"""
 
+    def __init__(
+        self,
+        callback: ClickFunction,
+        opts: Opts,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ):
+        self.callback = callback
+        self.opts = opts
+        self.args = args
+        self.kwargs = kwargs
+
+    def _repr_fields(self) -> str:
+        return (
+            f"callback={self.callback!r}, opts={self.opts!r},"
+            f" args={self.args!r}, kwargs={self.kwargs!r}"
+        )
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._repr_fields()})"
+
+
+_INFER_KEYS = ("type", "required", "is_flag", "nargs", "count", "flag_value")
+"""Keyword arguments that disable inferring click options from the type when given"""
+
+
+class _FieldPlan(NamedTuple):
+    """Precomputed data needed to convert a field back to arguments"""
+
+    name: str
+    """The name of the field"""
+
+    dashdash: str
+    """The --option name for options, empty for arguments"""
+
+    is_flag: bool
+    """The field is an option with is_flag"""
+
+    def to_args(self, obj: DataclassInstance) -> List[str]:
+        """Convert the field back to argument list using instantiated object"""
+        ret: List[str] = []
+        value = getattr(obj, self.name)
+        nameeq = (self.dashdash + "=") if self.dashdash else ""
+        if value is None:
+            pass
+        elif self.is_flag:
+            if value:
+                ret.append(self.dashdash)
+        elif isinstance(value, (list, tuple)):
+            for i in value:
+                ret.append(nameeq + str(i))
+        else:
+            ret.append(nameeq + str(value))
+        return ret
+
 
-@dataclasses.dataclass(frozen=True)
 class Field(FieldDesc):
     """Internal iterate to iterate over fields"""
 
+    __slots__ = (
+        "field",
+        "type",
+        "_is_option",
+        "_is_argument",
+        "_dashdash",
+        "_decorator",
+        "_plan",
+    )
+
     field: dataclasses.Field
     """The field"""
 
     type: Type
     """Resolved type from type hints"""
 
+    def __init__(
+        self,
+        callback: ClickFunction,
+        opts: Opts,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        field: dataclasses.Field,
+        type: Type,
+    ):
+        import click
+
+        super().__init__(callback, opts, args, kwargs)
+        self.field = field
+        self.type = type
+        # Cache is_option(), is_argument() and dashdashoption() on construction.
+        self._is_option = callback is click.option
+        self._is_argument = callback is click.argument
+        name = self.field.name.replace("_", self.opts.char)
+        self._dashdash = f"--{name}" if self.is_option() else name
+        self._decorator: Optional[Callable[[Callable], Callable]] = None
+        self._plan: Optional[_FieldPlan] = None
+
+    def _repr_fields(self) -> str:
+        return f"{super()._repr_fields()}, field={self.field!r}, type={self.type!r}"
+
     @property
     def name(self):
         return self.field.name
 
-    def is_option(self):
-        return self.callback == click.option
+    def is_option(self) -> bool:
+        return self._is_option
 
-    def is_argument(self):
-        return self.callback == click.argument
+    def is_argument(self) -> bool:
+        return self._is_argument
 
     def assert_type(self, arg_class: DataclassType):
         """Assert that the field has propert type matching click functions arguments"""
+        import click
+
         required = self.kwargs.get("required")
         multiple = self.kwargs.get("multiple")
         nargs = self.kwargs.get("nargs")
@@ -193,20 +321,19 @@ class Field(FieldDesc):
 
     def __infer_opts_from_type(self, kwargs: Dict[str, Any]):
         """Infer click options from the typing of the field"""
-        if self.type is not Any and all(
-            kwargs.get(x) is None
-            for x in "type required is_flag nargs count flag_value".split()
-        ):
+        if self.type is not Any and all(kwargs.get(x) is None for x in _INFER_KEYS):
+            kind = _classify_type(self.type)
+            args = get_args(self.type)
             if self.is_option():
                 # if the type is bool, add is_flag=True
                 if self.type in [bool, Optional[bool]]:
                     kwargs.setdefault("is_flag", True)
                 # if the type is Optional[T], add type=T
-                elif is_optional(self.type):
-                    kwargs.setdefault("type", get_args(self.type)[0])
+                elif kind == "optional":
+                    kwargs.setdefault("type", args[0])
                 # if the type is Tuple[T, ...], add type=T, multiple=True,
-                elif is_tuple_arr(self.type) or is_list(self.type):
-                    kwargs.setdefault("type", get_args(self.type)[0])
+                elif kind in ("tuple_arr", "list"):
+                    kwargs.setdefault("type", args[0])
                     kwargs.setdefault("multiple", True)
                 # if the type is T, add type=T, required=True
                 else:
@@ -214,19 +341,24 @@ class Field(FieldDesc):
                     kwargs.setdefault("type", self.type)
             elif self.is_argument():
                 # if the type is Tuple[T, ...], add type=T, nargs=-1
-                if is_tuple_arr(self.type) or is_list(self.type):
-                    kwargs.setdefault("type", get_args(self.type)[0])
+                if kind in ("tuple_arr", "list"):
+                    kwargs.setdefault("type", args[0])
                     kwargs.setdefault("nargs", -1)
                 else:
                     kwargs.setdefault("type", self.type)
 
     def dashdashoption(self) -> str:
         """Given an option return the dash dash with the option name"""
-        name = self.field.name.replace("_", self.opts.char)
-        name = f"--{name}" if self.is_option() else name
-        return name
+        return self._dashdash
 
     def apply(self) -> Callable[[Callable], Callable]:
+        """Return the click decorator for this field.
+        It only depends on the field, so it is created once and reused."""
+        if self._decorator is None:
+            self._decorator = self.__make_decorator()
+        return self._decorator
+
+    def __make_decorator(self) -> Callable[[Callable], Callable]:
         """Append the field name, with -- if it is an option, to the argument list."""
         args = list(self.args)
         if self.opts.arg:
@@ -246,24 +378,28 @@ class Field(FieldDesc):
                 f"Error calling {self.callback.__name__}({args}, {kwargs}) for {self}"
             )
 
+    def plan(self) -> _FieldPlan:
+        """Return the data needed by to_args.
+        It only depends on the field, so it is computed once and reused."""
+        if self._plan is None:
+            self._plan = self.__make_plan()
+        return self._plan
+
+    def __make_plan(self) -> _FieldPlan:
+        """Compute the data needed by to_args"""
+        kwargs = dict(self.kwargs)
+        if self.opts.infer:
+            self.__infer_opts_from_type(kwargs)
+        is_option = self.is_option()
+        return _FieldPlan(
+            name=self.name,
+            dashdash=self.dashdashoption() if is_option else "",
+            is_flag=is_option and bool(kwargs.get("is_flag")),
+        )
+
     def to_args(self, obj: DataclassInstance) -> List[str]:
         """Convert the option back to argument list using instantiated object"""
-        ret: List[str] = []
-        if self.is_option() or self.is_argument():
-            value = getattr(obj, self.name)
-            name = self.dashdashoption() if self.is_option() else ""
-            nameeq = (name + "=") if name else ""
-            if value is None:
-                pass
-            elif self.is_option() and self.kwargs.get("is_flag"):
-                if value:
-                    ret.append(name)
-            elif isinstance(value, (list, tuple)):
-                for i in value:
-                    ret.append(nameeq + str(i))
-            else:
-                ret.append(nameeq + str(value))
-        return ret
+        return self.plan().to_args(obj)
 
 
 ###############################################################################
@@ -272,24 +408,70 @@ TAG = "clickdc"
 """The metadata name used in dataclass field for arguments of this module"""
 
 
-def _myfields(arg_class: DataclassType) -> List[Field]:
-    """Iterate over fields that we handle"""
-    hints = get_type_hints(arg_class)
+def _cache_per_class(
+    func: Callable[[DataclassType], T],
+) -> Callable[[DataclassType], T]:
+    """Cache the result of func per class.
+    Weak references are used, so that classes created dynamically can be freed."""
+    cache: "weakref.WeakKeyDictionary[DataclassType, T]" = weakref.WeakKeyDictionary()
+
+    @functools.wraps(func)
+    def wrapper(arg_class: DataclassType) -> T:
+        try:
+            return cache[arg_class]
+        except KeyError:
+            ret = cache[arg_class] = func(arg_class)
+            return ret
+
+    return wrapper
+
+
+@_cache_per_class
+def _myfields(arg_class: DataclassType) -> Tuple[Field, ...]:
+    """Iterate over fields that we handle.
+    The result only depends on the class, so it is computed once per class."""
+    hints: Optional[Dict[str, Any]] = None
     ret: List[Field] = []
-    for field in dataclasses.fields(arg_class):
-        desc: Optional[FieldDesc] = field.metadata.get(TAG)
-        if desc:
-            ret.append(
-                Field(
-                    desc.callback,
-                    desc.opts,
-                    desc.args,
-                    desc.kwargs,
-                    field=field,
-                    type=hints[field.name],
-                )
+    # Fields created without this module have empty metadata, skip them early.
+    tagged: List[Tuple[dataclasses.Field, FieldDesc]] = [
+        (field, field.metadata[TAG])
+        for field in dataclasses.fields(arg_class)
+        if field.metadata and TAG in field.metadata
+    ]
+    for field, desc in tagged:
+        fieldtype = field.type
+        # A plain class is already resolved. Anything else, including list[T] which
+        # is an instance of type before Python 3.11, may be a string,
+        # contain forward references or be Annotated, so resolve type hints,
+        # once per class.
+        if not (isinstance(fieldtype, type) and not get_args(fieldtype)):
+            if hints is None:
+                hints = get_type_hints(arg_class)
+            fieldtype = hints[field.name]
+        ret.append(
+            Field(
+                desc.callback,
+                desc.opts,
+                desc.args,
+                desc.kwargs,
+                field=field,
+                type=fieldtype,
             )
-    return ret
+        )
+    return tuple(ret)
+
+
+@_cache_per_class
+def _fieldplans(arg_class: DataclassType) -> Tuple[_FieldPlan, ...]:
+    """Options followed by arguments of the dataclass, in the order used by to_args"""
+    options: List[_FieldPlan] = []
+    arguments: List[_FieldPlan] = []
+    for ff in _myfields(arg_class):
+        if ff.is_option():
+            options.append(ff.plan())
+        elif ff.is_argument():
+            arguments.append(ff.plan())
+    return tuple(options + arguments)
 
 
 def _mkfield(
@@ -299,7 +481,7 @@ def _mkfield(
     kwargs: Dict[str, Any],
     default: Any,
 ) -> Any:
-    clickdc = Opts(no=True) if clickdc is None else clickdc
+    clickdc = _OPTS_NO if clickdc is None else clickdc
     # Restore default and pass them to click arguments if present.
     if default is not dataclasses.MISSING:
         kwargs["default"] = default
@@ -316,12 +498,14 @@ def _mkfield(
             return default()
 
         default = make_default_class
-    elif isinstance(default, (dict, list)):
+    elif isinstance(default, (dict, list, set, bytearray)):
 
         def make_default_list(default=default):
-            return type(default)(default)
+            return copy.copy(default)
 
         default = make_default_list
+    # Other defaults, like tuple, frozenset, str or numbers, are immutable.
+    # They are safely shared between instances and are used directly as default.
     # Problem: pyright complains that default or default_factory cannot be MISSING.
     # Solution: just write an if.
     if default is dataclasses.MISSING:
@@ -340,7 +524,7 @@ def option(
     *args,
     is_flag: Literal[True],
     default: Union[type(dataclasses.MISSING), bool] = dataclasses.MISSING,
-    clickdc: Optional[Opts] = Opts(),
+    clickdc: Optional[Opts] = ...,
     **kwargs,
 ) -> bool: ...
 @overload
@@ -348,7 +532,7 @@ def option(
     *args,
     default: T,
     is_flag: Literal[False, None] = None,
-    clickdc: Optional[Opts] = Opts(),
+    clickdc: Optional[Opts] = ...,
     **kwargs,
 ) -> T: ...
 @overload
@@ -356,36 +540,44 @@ def option(
     *args,
     default: Callable[[], T],
     is_flag: Literal[False, None] = None,
-    clickdc: Optional[Opts] = Opts(),
+    clickdc: Optional[Opts] = ...,
     **kwargs,
 ) -> T: ...
 @overload
 def option(
     *args,
     is_flag: Literal[False, None] = None,
-    clickdc: Optional[Opts] = Opts(),
+    clickdc: Optional[Opts] = ...,
     **kwargs,
 ) -> Any: ...
-@functools.wraps(click.option)
 def option(
     *args,
     is_flag: Optional[bool] = None,
     default: Any = dataclasses.MISSING,
-    clickdc: Optional[Opts] = Opts(),
+    clickdc: Optional[Opts] = _OPTS_DEFAULT,
     **kwargs,
 ):
+    """Define a dataclass field parsed with click.option.
+    Takes the same arguments as click.option,
+    and additionally clickdc with the Opts of this module."""
+    import click
+
     if is_flag is not None:
         kwargs["is_flag"] = is_flag
     return _mkfield(click.option, clickdc, args, kwargs, default)
 
 
-@functools.wraps(click.argument)
 def argument(
     *args,
-    clickdc: Optional[Opts] = Opts(),
+    clickdc: Optional[Opts] = _OPTS_DEFAULT,
     default: Any = dataclasses.MISSING,
     **kwargs,
 ) -> Any:
+    """Define a dataclass field parsed with click.argument.
+    Takes the same arguments as click.argument,
+    and additionally clickdc with the Opts of this module."""
+    import click
+
     return _mkfield(click.argument, clickdc, args, kwargs, default)
 
 
@@ -402,20 +594,22 @@ def adddc(kw_name: str, arg_class: DataclassType):
         arg_class
     ), f"Passed argument is not a dataclass: {arg_class}"
     # _assert_annotations(arg_class)
+    fields = _myfields(arg_class)
+    names = tuple(ff.name for ff in fields)
 
     def dataclass_click_in(func: Callable) -> Callable:
         @functools.wraps(func)
         def dataclass_click_wrapper(*args, **kwargs):
             # Given command line arguments in kwargs, collect and remove the ones in our dataclass.
             arg_class_args = {}
-            for ff in _myfields(arg_class):
-                if ff.name in kwargs:
-                    arg_class_args[ff.name] = kwargs[ff.name]
-                    del kwargs[ff.name]
-                    # Problem: I want to allow list[T], because typing tuple[T, ...] is boring.
-                    # Solution: dynamically convert.
-                    # if is_tuple_arr(type(arg_class_args[ff.name])) and is_list(ff.type):
-                    #     arg_class_args[ff.name] = list(arg_class_args[ff.name])
+            for name in names:
+                value = kwargs.pop(name, dataclasses.MISSING)
+                if value is not dataclasses.MISSING:
+                    arg_class_args[name] = value
+            # Problem: I want to allow list[T], because typing tuple[T, ...] is boring.
+            # Solution: dynamically convert.
+            # if is_tuple_arr(type(arg_class_args[ff.name])) and is_list(ff.type):
+            #     arg_class_args[ff.name] = list(arg_class_args[ff.name])
             # Construct the dataclass and assign it to kw_name.
             kwargs[kw_name] = arg_class(**arg_class_args)
             # Call the inner function.
@@ -423,7 +617,7 @@ def adddc(kw_name: str, arg_class: DataclassType):
 
         wrapper = dataclass_click_wrapper
         # For each field, apply the click.option() decorators over the function.
-        for ff in reversed(_myfields(arg_class)):
+        for ff in reversed(fields):
             try:
                 call = ff.apply()
                 wrapper = call(wrapper)
@@ -445,12 +639,8 @@ def to_args(obj: DataclassInstance) -> List[str]:
     """Given an parsed instance of click arguments, convert it back to list of arguments"""
     assert dataclasses.is_dataclass(obj), f"argument is not a dataclass: {obj}"
     ret: List[str] = []
-    for ff in _myfields(type(obj)):
-        if ff.callback == click.option:
-            ret += ff.to_args(obj)
-    for ff in _myfields(type(obj)):
-        if ff.callback == click.argument:
-            ret += ff.to_args(obj)
+    for plan in _fieldplans(type(obj)):
+        ret += plan.to_args(obj)
     return ret
 
 
@@ -459,30 +649,46 @@ def to_args(obj: DataclassInstance) -> List[str]:
 
 def __alias_option_callback(
     aliased: Dict[str, Any],
-    ctx: click.Context,
-    param: click.Parameter,
+    ctx: "click.Context",
+    param: "click.Parameter",
     value: Any,
 ):
     """Callback called from alias_option option."""
     if value:
+        import click
+
+        params = {p.name: p for p in ctx.command.params}
+        # Problem: changing the param default would persist across invocations of the command.
+        # Solution: set the new defaults in the default_map of this invocation context.
+        # The default_map of a group also holds the default maps of its subcommands by name,
+        # so for groups the param default is still changed.
+        ingroup = isinstance(ctx.command, click.Group)
+        defaults: Dict[str, Any] = dict(ctx.default_map or {})
         for paramname, val in aliased.items():
-            try:
-                aliasparam = next(p for p in ctx.command.params if p.name == paramname)
-            except KeyError:
+            aliasparam = params.get(paramname)
+            if aliasparam is None:
                 raise Exception(
                     f"Did not found option named {paramname} aliased by {param.name}"
                 )
             if aliasparam.multiple:
-                orig: Iterable = aliasparam.default or []  # pyright: ignore
+                orig: Iterable = (
+                    aliasparam.default
+                    if ingroup
+                    else defaults.get(paramname, aliasparam.default)
+                ) or []  # pyright: ignore
                 try:
-                    aliasparam.default = list(orig) + [val]
+                    val = list(orig) + [val]
                 except TypeError:
                     raise Exception(
                         f"alias_option {param.name} cannot append to default of param {paramname}"
                         f" because the default is not a iterable"
                     )
-            else:
+            if ingroup:
                 aliasparam.default = val
+            else:
+                defaults[paramname] = val
+        if not ingroup:
+            ctx.default_map = defaults
     return value
 
 
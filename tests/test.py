@@ -1,293 +1,549 @@
 #!/usr/bin/env python3
+import functools
 import shlex
 import traceback
-from typing import Any, List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, List, Optional, Set, Tuple, Union
 
 import click
+import pydantic.dataclasses
+import pytest
 from click.testing import CliRunner
-from pydantic.dataclasses import dataclass
+from typing_extensions import Annotated
 
 import clickdc
 
+RUNNER = CliRunner(mix_stderr=True)
+
 
 def invoke(*args, **kwargs):
-    return CliRunner(mix_stderr=True).invoke(*args, **kwargs)
+    return RUNNER.invoke(*args, **kwargs)
 
 
-def run(arg_class, input: str, output: Any = None, fail: int = 0, toargs: bool = False):
+@functools.lru_cache(maxsize=None)
+def split(input: str) -> Tuple[str, ...]:
+    return tuple(shlex.split(input))
+
+
+@functools.lru_cache(maxsize=None)
+def build_cli(arg_class, toargs: bool) -> click.Command:
     @click.command(help=f"Testing {arg_class}")
     @clickdc.adddc("args", arg_class)
     def cli(args):
-        try:
-            if not toargs:
-                click.echo(args)
-            else:
-                click.echo(" ".join(clickdc.to_args(args)))
-        except Exception:
-            traceback.print_exc()
-            raise
-
-    r = invoke(cli, shlex.split(input))
-    info = "\n".join(
-        [
+        # Exceptions are captured by CliRunner in exc_info and shown by run().
+        if not toargs:
+            click.echo(args)
+        else:
+            click.echo(" ".join(clickdc.to_args(args)))
+
+    return cli
+
+
+def run(arg_class, input: str, output: Any = None, fail: int = 0, toargs: bool = False):
+    r = invoke(build_cli(arg_class, toargs), split(input))
+    # r.output decodes the captured bytes on each access.
+    # stderr is mixed into the output by the runner.
+    out, exc_info = r.output, r.exc_info
+
+    def info() -> str:
+        # Only called when an assertion fails.
+        parts = [
             f"Testing class {arg_class!r} using input {input!r} resulted in",
             "--- output:",
-            f"{r.output}",
-            *(
-                [
-                    "--- stderr:",
-                    f"{r.stderr}",
-                ]
-                if r.stderr_bytes
-                else []
-            ),
-            *(
-                [
-                    "--- exception:",
-                    "\n".join(
-                        x.strip()
-                        for x in traceback.format_exception(*r.exc_info)
-                        if x.strip()
-                    ),
-                ]
-                if r.exc_info
-                else []
-            ),
-            "---",
+            out,
         ]
-    )
+        if exc_info:
+            parts.append("--- exception:")
+            parts.extend(
+                x.strip() for x in traceback.format_exception(*exc_info) if x.strip()
+            )
+        parts.append("---")
+        return "\n".join(parts)
+
     if fail:
-        assert r.exit_code != 0, info
+        assert r.exit_code != 0, info()
     else:
-        assert r.exit_code == 0, info
+        assert r.exit_code == 0, info()
     if output is not None:
-        assert r.output == f"{output}\n", info
+        assert out == f"{output}\n", info()
 
 
-def test_internal():
-    assert clickdc.is_list(List[Any])
-    assert clickdc.is_list(List[int])
-    assert clickdc.is_tuple_arr(Tuple[Any, ...])
+@pytest.mark.parametrize(
+    "fn,arg",
+    [
+        (clickdc.is_list, List[Any]),
+        (clickdc.is_list, List[int]),
+        (clickdc.is_tuple_arr, Tuple[Any, ...]),
+    ],
+)
+def test_internal(fn, arg):
+    assert fn(arg)
 
 
-def test_command():
+def test_optional_after_equal_type():
+    # Union[None, int] compares equal to Optional[int], but is not Optional[T].
     @dataclass
-    class Args:
-        cmd: int = clickdc.argument()
+    class ArgsUnion:
+        x: Union[None, int] = clickdc.option()
 
-    run(Args, "123", Args(cmd=123))
+    @click.command()
+    @clickdc.adddc("args", ArgsUnion)
+    def cli(args):
+        pass
 
+    assert not clickdc.is_optional(Union[None, int])  # pyright: ignore
+    assert clickdc.is_optional(Optional[int])  # pyright: ignore
 
-def test_option_int():
     @dataclass
     class Args:
-        option: int = clickdc.option("-o")
+        y: Optional[int] = clickdc.option()
 
-    run(Args, "", fail=1)
-    run(Args, "-o 123", Args(option=123))
+    run(Args, "", Args(y=None))
 
 
-def test_option_optional_int():
-    @dataclass
-    class Args:
-        option: Optional[int] = clickdc.option("-o")
+def test_unhashable_type():
+    assert not clickdc.is_optional(Annotated[int, {"k": 1}])  # pyright: ignore
 
-    run(Args, "", Args(option=None))
-    run(Args, "-o 123", Args(option=123))
 
-
-def test_flag_1():
+def test_command():
     @dataclass
     class Args:
-        option: bool = clickdc.option()
+        cmd: int = clickdc.argument()
 
-    run(Args, "", Args(option=False))
-    run(Args, "--option", Args(option=True))
+    run(Args, "123", Args(cmd=123))
 
 
-def test_flag_2():
-    @dataclass
-    class Args:
-        option: Optional[bool] = clickdc.option()
+# Tests running multiple inputs on the same dataclass define it once at module
+# scope and are parametrized over the inputs.
 
-    run(Args, "", Args(option=False))
-    run(Args, "--option", Args(option=True))
 
+@dataclass
+class ArgsOptionInt:
+    option: int = clickdc.option("-o")
 
-def test_flag_3():
-    @dataclass
-    class Args:
-        option: bool = clickdc.option(is_flag=True)
 
-    run(Args, "", Args())
-    run(Args, "", Args(option=False))
-    run(Args, "--option", Args(option=True))
+@pytest.mark.parametrize(
+    "input,output,fail",
+    [
+        ("", None, 1),
+        ("-o 123", ArgsOptionInt(option=123), 0),
+    ],
+)
+def test_option_int(input, output, fail):
+    run(ArgsOptionInt, input, output, fail=fail)
 
 
-def test_float_option():
-    @dataclass
-    class Args:
-        option: float = clickdc.option(default=1.0)
+@dataclass
+class ArgsOptionOptionalInt:
+    option: Optional[int] = clickdc.option("-o")
 
-    run(Args, "", Args())
-    run(Args, "", Args(option=1.0))
-    run(Args, "--option str", fail=1)
-    run(Args, "--option 2.0", Args(option=2.0))
 
+@pytest.mark.parametrize(
+    "input,output",
+    [
+        ("", ArgsOptionOptionalInt(option=None)),
+        ("-o 123", ArgsOptionOptionalInt(option=123)),
+    ],
+)
+def test_option_optional_int(input, output):
+    run(ArgsOptionOptionalInt, input, output)
 
-def test_float_argument():
-    @dataclass
-    class Args:
-        arg: float = clickdc.argument()
 
-    run(Args, "", fail=1)
-    run(Args, "str", fail=1)
-    run(Args, "2.0", Args(arg=2.0))
+@dataclass
+class ArgsFlag1:
+    option: bool = clickdc.option()
 
 
-def test_multiple():
-    @dataclass
-    class Args:
-        arg: Tuple[float, ...] = clickdc.argument(nargs=-1, type=float, required=True)
+@pytest.mark.parametrize(
+    "input,output",
+    [
+        ("", ArgsFlag1(option=False)),
+        ("--option", ArgsFlag1(option=True)),
+    ],
+)
+def test_flag_1(input, output):
+    run(ArgsFlag1, input, output)
 
-    run(Args, "", fail=1)
-    run(Args, "str", fail=1)
-    run(Args, "2.0", Args(arg=(2.0,)))
-    run(Args, "2.0 3.0", Args(arg=(2.0, 3.0)))
 
+@dataclass
+class ArgsFlag2:
+    option: Optional[bool] = clickdc.option()
 
-def test_multiple_auto():
-    @dataclass
-    class Args:
-        arg: Tuple[float, ...] = clickdc.argument()
 
-    run(Args, "str", fail=1)
-    run(Args, "", Args(arg=tuple()))
-    run(Args, "2.0", Args(arg=(2.0,)))
-    run(Args, "2.0 3.0", Args(arg=(2.0, 3.0)))
+@pytest.mark.parametrize(
+    "input,output",
+    [
+        ("", ArgsFlag2(option=False)),
+        ("--option", ArgsFlag2(option=True)),
+    ],
+)
+def test_flag_2(input, output):
+    run(ArgsFlag2, input, output)
 
 
-def test_example1():
-    @dataclass
-    class Args:
-        option: bool = clickdc.option(is_flag=True, help="This is an option")
-        command: int = clickdc.argument(type=int)
+@dataclass
+class ArgsFlag3:
+    option: bool = clickdc.option(is_flag=True)
+
 
-    run(Args, "str", fail=1)
-    run(Args, "1", Args(option=False, command=1))
-    run(Args, "1", Args(command=1))
+@pytest.mark.parametrize(
+    "input,output",
+    [
+        ("", ArgsFlag3()),
+        ("", ArgsFlag3(option=False)),
+        ("--option", ArgsFlag3(option=True)),
+    ],
+)
+def test_flag_3(input, output):
+    run(ArgsFlag3, input, output)
 
 
-def test_example2():
-    @dataclass
-    class Args:
-        custom: Tuple[float, ...] = clickdc.option(type=float, multiple=True)
-        moreargs: Tuple[int, ...] = clickdc.argument(type=int, nargs=5)
-        options: Tuple[float, ...] = clickdc.option()
-        arguments: Tuple[int, ...] = clickdc.argument()
-
-    run(Args, "1 2 3 4", fail=1)
-    run(
-        Args,
-        "1 2 3 4 5",
-        Args(
-            custom=tuple(),
-            moreargs=(1, 2, 3, 4, 5),
-            options=tuple(),
-            arguments=tuple(),
+@dataclass
+class ArgsFloatOption:
+    option: float = clickdc.option(default=1.0)
+
+
+@pytest.mark.parametrize(
+    "input,output,fail",
+    [
+        ("", ArgsFloatOption(), 0),
+        ("", ArgsFloatOption(option=1.0), 0),
+        ("--option str", None, 1),
+        ("--option 2.0", ArgsFloatOption(option=2.0), 0),
+    ],
+)
+def test_float_option(input, output, fail):
+    run(ArgsFloatOption, input, output, fail=fail)
+
+
+@dataclass
+class ArgsFloatArgument:
+    arg: float = clickdc.argument()
+
+
+@pytest.mark.parametrize(
+    "input,output,fail",
+    [
+        ("", None, 1),
+        ("str", None, 1),
+        ("2.0", ArgsFloatArgument(arg=2.0), 0),
+    ],
+)
+def test_float_argument(input, output, fail):
+    run(ArgsFloatArgument, input, output, fail=fail)
+
+
+@dataclass
+class ArgsMultiple:
+    arg: Tuple[float, ...] = clickdc.argument(nargs=-1, type=float, required=True)
+
+
+@pytest.mark.parametrize(
+    "input,output,fail",
+    [
+        ("", None, 1),
+        ("str", None, 1),
+        ("2.0", ArgsMultiple(arg=(2.0,)), 0),
+        ("2.0 3.0", ArgsMultiple(arg=(2.0, 3.0)), 0),
+    ],
+)
+def test_multiple(input, output, fail):
+    run(ArgsMultiple, input, output, fail=fail)
+
+
+@dataclass
+class ArgsMultipleAuto:
+    arg: Tuple[float, ...] = clickdc.argument()
+
+
+@pytest.mark.parametrize(
+    "input,output,fail",
+    [
+        ("str", None, 1),
+        ("", ArgsMultipleAuto(arg=tuple()), 0),
+        ("2.0", ArgsMultipleAuto(arg=(2.0,)), 0),
+        ("2.0 3.0", ArgsMultipleAuto(arg=(2.0, 3.0)), 0),
+    ],
+)
+def test_multiple_auto(input, output, fail):
+    run(ArgsMultipleAuto, input, output, fail=fail)
+
+
+@dataclass
+class ArgsExample1:
+    option: bool = clickdc.option(is_flag=True, help="This is an option")
+    command: int = clickdc.argument(type=int)
+
+
+@pytest.mark.parametrize(
+    "input,output,fail",
+    [
+        ("str", None, 1),
+        ("1", ArgsExample1(option=False, command=1), 0),
+        ("1", ArgsExample1(command=1), 0),
+    ],
+)
+def test_example1(input, output, fail):
+    run(ArgsExample1, input, output, fail=fail)
+
+
+@dataclass
+class ArgsExample2:
+    custom: Tuple[float, ...] = clickdc.option(type=float, multiple=True)
+    moreargs: Tuple[int, ...] = clickdc.argument(type=int, nargs=5)
+    options: Tuple[float, ...] = clickdc.option()
+    arguments: Tuple[int, ...] = clickdc.argument()
+
+
+@pytest.mark.parametrize(
+    "input,output,fail",
+    [
+        ("1 2 3 4", None, 1),
+        (
+            "1 2 3 4 5",
+            ArgsExample2(
+                custom=tuple(),
+                moreargs=(1, 2, 3, 4, 5),
+                options=tuple(),
+                arguments=tuple(),
+            ),
+            0,
         ),
-    )
-    run(
-        Args,
-        "--custom=1.0 --options=2.0 1 2 3 4 5 6",
-        Args(
-            custom=(1.0,),
-            moreargs=(1, 2, 3, 4, 5),
-            options=(2.0,),
-            arguments=(6,),
+        (
+            "--custom=1.0 --options=2.0 1 2 3 4 5 6",
+            ArgsExample2(
+                custom=(1.0,),
+                moreargs=(1, 2, 3, 4, 5),
+                options=(2.0,),
+                arguments=(6,),
+            ),
+            0,
+        ),
+    ],
+)
+def test_example2(input, output, fail):
+    run(ArgsExample2, input, output, fail=fail)
+
+
+@dataclass
+class ArgsDisable:
+    option: bool = clickdc.option("--option", is_flag=True, clickdc=None)
+    command: int = clickdc.argument("command", type=int, clickdc=None)
+
+
+@pytest.mark.parametrize(
+    "input,output,fail",
+    [
+        ("", None, 1),
+        ("--option 123", ArgsDisable(option=True, command=123), 0),
+    ],
+)
+def test_disable(input, output, fail):
+    run(ArgsDisable, input, output, fail=fail)
+
+
+@dataclass
+class ArgsAliasMultiple:
+    sum: Tuple[int, ...] = clickdc.option(multiple=True, type=int, default=(3, 4))
+    add: bool = clickdc.option(is_flag=True)
+    add1: bool = clickdc.alias_option(aliased=dict(sum="1"))
+    add2: bool = clickdc.alias_option(aliased=dict(sum="2"))
+
+
+@pytest.mark.parametrize(
+    "input,output",
+    [
+        ("--add", ArgsAliasMultiple(add=True)),
+        ("--add", ArgsAliasMultiple(sum=(3, 4), add=True, add1=False, add2=False)),
+        ("--add1", ArgsAliasMultiple(sum=(3, 4, 1), add=False, add1=True, add2=False)),
+        ("--add2", ArgsAliasMultiple(sum=(3, 4, 2), add=False, add1=False, add2=True)),
+        (
+            "--add1 --add2",
+            ArgsAliasMultiple(sum=(3, 4, 1, 2), add=False, add1=True, add2=True),
         ),
-    )
+    ],
+)
+def test_alias_multiple(input, output):
+    run(ArgsAliasMultiple, input, output)
 
 
-def test_disable():
-    @dataclass
-    class Args:
-        option: bool = clickdc.option("--option", is_flag=True, clickdc=None)
-        command: int = clickdc.argument("command", type=int, clickdc=None)
+def test_alias_multiple_same_command():
+    # The aliased values must not leak into the next invocation of the command.
+    @click.command()
+    @clickdc.adddc("args", ArgsAliasMultiple)
+    def cli(args):
+        click.echo(args)
 
-    run(Args, "", fail=1)
-    run(Args, "--option 123", Args(option=True, command=123))
+    r = invoke(cli, ["--add1"])
+    assert r.exit_code == 0, r.output
+    assert r.output == f"{ArgsAliasMultiple(sum=(3, 4, 1), add1=True)}\n"
+    r = invoke(cli, [])
+    assert r.exit_code == 0, r.output
+    assert r.output == f"{ArgsAliasMultiple(sum=(3, 4))}\n"
 
 
-def test_alias_multiple():
+def test_alias_missing_option():
     @dataclass
     class Args:
-        sum: Tuple[int, ...] = clickdc.option(multiple=True, type=int, default=(3, 4))
-        add: bool = clickdc.option(is_flag=True)
-        add1: bool = clickdc.alias_option(aliased=dict(sum="1"))
-        add2: bool = clickdc.alias_option(aliased=dict(sum="2"))
-
-    run(Args, "--add", Args(add=True))
-    run(Args, "--add", Args(sum=(3, 4), add=True, add1=False, add2=False))
-    run(Args, "--add1", Args(sum=(3, 4, 1), add=False, add1=True, add2=False))
-    run(Args, "--add2", Args(sum=(3, 4, 2), add=False, add1=False, add2=True))
-    run(
-        Args,
-        "--add1 --add2",
-        Args(sum=(3, 4, 1, 2), add=False, add1=True, add2=True),
-    )
-
-
-def test_to_args():
-    @dataclass
-    class Args:
-        opta: bool = clickdc.option("-a")
-        optb: Tuple[int, ...] = clickdc.option("-b")
-        optc: Tuple[str, ...] = clickdc.option("-c")
-        optd: Optional[str] = clickdc.option("-d")
-        cmda: int = clickdc.argument()
-        cmdb: int = clickdc.argument()
-        cmdc: Tuple[int, ...] = clickdc.argument()
-
-    run(Args, "1 2 3 4 5 6", "1 2 3 4 5 6", toargs=True)
-    run(Args, "--opta 1 2 3 4", "--opta 1 2 3 4", toargs=True)
-    run(Args, "-a 1 2 3 4", "--opta 1 2 3 4", toargs=True)
-    run(Args, "-a -b 1 -b 2 1 2 3", "--opta --optb=1 --optb=2 1 2 3", toargs=True)
-    run(
-        Args,
-        "-a -b 1 -b 2 -c aaa -c bbb -c ddd 1 2 3",
-        "--opta --optb=1 --optb=2 --optc=aaa --optc=bbb --optc=ddd 1 2 3",
-        toargs=True,
-    )
-    run(Args, "-d aaa -d bbb -d ccc 1 2 3", "--optd=ccc 1 2 3", toargs=True)
-
-
-def test_to_list_option():
-    @dataclass
-    class Args:
-        a: List[int] = clickdc.option("-a")
+        add: bool = clickdc.alias_option(aliased=dict(nope=1))
+
+    @click.command()
+    @clickdc.adddc("args", Args)
+    def cli(args):
+        click.echo(args)
 
-    run(Args, "", Args(a=[]))
-    run(Args, "-a 3 -a 4", Args(a=[3, 4]))
-    run(Args, "-a 1 -a 2", Args(a=[1, 2]))
+    r = invoke(cli, ["--add"])
+    assert r.exit_code != 0, r.output
+    assert "Did not found option named nope aliased by add" in str(r.exception)
 
 
-def test_to_list_option_default():
-    @dataclass
-    class Args:
-        a: List[int] = clickdc.option("-a", default=[1, 2])
+def test_alias_group_subcommand_named_like_param():
+    # The default_map of a group holds the default maps of its subcommands by name.
+    @click.group()
+    @clickdc.adddc("args", ArgsAliasMultiple)
+    def cli(args):
+        click.echo(args)
+
+    @cli.command("sum")
+    @click.option("--x", default=1)
+    def sum_(x):
+        click.echo(x)
+
+    r = invoke(cli, ["--add1", "sum"])
+    assert r.exit_code == 0, r.output
+    assert r.output == f"{ArgsAliasMultiple(sum=(3, 4, 1), add1=True)}\n1\n"
+
+
+@dataclass
+class ArgsToArgs:
+    opta: bool = clickdc.option("-a")
+    optb: Tuple[int, ...] = clickdc.option("-b")
+    optc: Tuple[str, ...] = clickdc.option("-c")
+    optd: Optional[str] = clickdc.option("-d")
+    cmda: int = clickdc.argument()
+    cmdb: int = clickdc.argument()
+    cmdc: Tuple[int, ...] = clickdc.argument()
+
+
+@pytest.mark.parametrize(
+    "input,output",
+    [
+        ("1 2 3 4 5 6", "1 2 3 4 5 6"),
+        ("--opta 1 2 3 4", "--opta 1 2 3 4"),
+        ("-a 1 2 3 4", "--opta 1 2 3 4"),
+        ("-a -b 1 -b 2 1 2 3", "--opta --optb=1 --optb=2 1 2 3"),
+        (
+            "-a -b 1 -b 2 -c aaa -c bbb -c ddd 1 2 3",
+            "--opta --optb=1 --optb=2 --optc=aaa --optc=bbb --optc=ddd 1 2 3",
+        ),
+        ("-d aaa -d bbb -d ccc 1 2 3", "--optd=ccc 1 2 3"),
+    ],
+)
+def test_to_args(input, output):
+    run(ArgsToArgs, input, output, toargs=True)
+
+
+def test_field_to_args():
+    obj = ArgsToArgs(True, (1, 2), (), None, 1, 2, (3,))
+    args = [arg for ff in clickdc._myfields(ArgsToArgs) for arg in ff.to_args(obj)]
+    assert args == ["--opta", "--optb=1", "--optb=2", "1", "2", "3"]
+
+
+@dataclass
+class ArgsAnnotated:
+    a: Annotated[Tuple[int, ...], "doc"] = clickdc.option()
+
 
-    run(Args, "", Args())
-    run(Args, "", Args(a=[1, 2]))
-    run(Args, "-a 3 -a 4", Args(a=[3, 4]))
-    run(Args, "-a 1 -a 2", Args())
+@pytest.mark.parametrize(
+    "input,output",
+    [
+        ("", ArgsAnnotated(a=())),
+        ("--a 3 --a 4", ArgsAnnotated(a=(3, 4))),
+    ],
+)
+def test_annotated(input, output):
+    run(ArgsAnnotated, input, output)
 
 
-def test_to_list_argument():
+@dataclass
+class ArgsForwardRef:
+    b: Optional["int"] = clickdc.option()
+
+
+@pytest.mark.parametrize(
+    "input,output",
+    [
+        ("", ArgsForwardRef(b=None)),
+        ("--b 3", ArgsForwardRef(b=3)),
+    ],
+)
+def test_forward_ref(input, output):
+    run(ArgsForwardRef, input, output)
+
+
+# pydantic converts the tuple returned by click to a list.
+
+
+@pydantic.dataclasses.dataclass
+class ArgsToListOption:
+    a: List[int] = clickdc.option("-a")
+
+
+@pytest.mark.parametrize(
+    "input,output",
+    [
+        ("", ArgsToListOption(a=[])),
+        ("-a 3 -a 4", ArgsToListOption(a=[3, 4])),
+        ("-a 1 -a 2", ArgsToListOption(a=[1, 2])),
+    ],
+)
+def test_to_list_option(input, output):
+    run(ArgsToListOption, input, output)
+
+
+@pydantic.dataclasses.dataclass
+class ArgsToListOptionDefault:
+    a: List[int] = clickdc.option("-a", default=[1, 2])
+
+
+@pytest.mark.parametrize(
+    "input,output",
+    [
+        ("", ArgsToListOptionDefault()),
+        ("", ArgsToListOptionDefault(a=[1, 2])),
+        ("-a 3 -a 4", ArgsToListOptionDefault(a=[3, 4])),
+        ("-a 1 -a 2", ArgsToListOptionDefault()),
+    ],
+)
+def test_to_list_option_default(input, output):
+    run(ArgsToListOptionDefault, input, output)
+
+
+@pydantic.dataclasses.dataclass
+class ArgsToListArgument:
+    cmdc: List[int] = clickdc.argument()
+
+
+@pytest.mark.parametrize(
+    "input,output",
+    [
+        ("", ArgsToListArgument([])),
+        ("3 4", ArgsToListArgument([3, 4])),
+        ("1 2", ArgsToListArgument([1, 2])),
+    ],
+)
+def test_to_list_argument(input, output):
+    run(ArgsToListArgument, input, output)
+
+
+def test_mutable_default_is_copied():
     @dataclass
     class Args:
-        cmdc: List[int] = clickdc.argument()
-
-    run(Args, "", Args([]))
-    run(Args, "3 4", Args([3, 4]))
-    run(Args, "1 2", Args([1, 2]))
+        a: Set[int] = clickdc.option(default={1, 2})
+        b: bytearray = clickdc.option(default=bytearray(b"ab"), type=str)
+
+    x, y = Args(), Args()
+    assert x.a == y.a == {1, 2}
+    assert x.a is not y.a
+    assert x.b == y.b == bytearray(b"ab")
+    assert x.b is not y.b
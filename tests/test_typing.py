@@ -1,7 +1,11 @@
+import contextlib
+import io
 import pytest
+import runpy
 import subprocess
 from pathlib import Path
 import re
+from typing import Dict, Tuple
 
 DIR = Path(__file__).parent.parent
 pyright = ["python3", "-m", "pyright"]
@@ -17,25 +21,57 @@ def test_typing():
 
 typing_tests = DIR / "typing_tests"
 files = list(str(x.relative_to(typing_tests)) for x in typing_tests.glob("*.py"))
+paths = {f: (typing_tests / f).resolve() for f in files}
 
 
-@pytest.mark.parametrize("filestr", files)
-def test_typing_file(filestr: str):
-    file = Path(typing_tests / filestr)
-    pattern = subprocess.check_output(
-        ["python3", str(file.absolute())],
-        cwd=file.parent,
-        text=True,
-    ).strip()
-    pp = subprocess.run(
-        [*pyright, str(file.absolute())],
-        cwd=file.parent,
+def read_pattern(filestr: str) -> str:
+    """Each typing test prints the pattern expected in pyright output.
+    The files only define a dataclass and print, so run them in this process."""
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        runpy.run_path(str(paths[filestr]), run_name="__main__")
+    return out.getvalue().strip()
+
+
+def split_pyright_output(stdout: str) -> Dict[str, str]:
+    """Each file with errors starts with a line with the file path,
+    followed by indented lines with the errors."""
+    ret: Dict[str, str] = {}
+    section = ""
+    for line in stdout.splitlines():
+        if not line.startswith(" "):
+            section = line
+        ret[section] = ret.get(section, "") + line + "\n"
+    return ret
+
+
+@pytest.fixture(scope="session")
+def typing_results() -> Dict[str, Tuple[str, str]]:
+    """Map each typing test to its expected pattern and its pyright output.
+    pyright runs once over all files, the patterns are read while it runs."""
+    with subprocess.Popen(
+        [*pyright, *(str(paths[f]) for f in files)],
+        cwd=typing_tests,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
-    )
-    assert pp.returncode == 1, f"pyright {file} failed, but should have succeeded"
-    output = pp.stdout
+    ) as pp:
+        try:
+            patterns = {f: read_pattern(f) for f in files}
+        except BaseException:
+            # Nothing reads the output of pyright, so do not wait for it.
+            pp.kill()
+            raise
+        stdout, _ = pp.communicate()
+    assert pp.returncode in (0, 1), f"pyright failed to run\n---\n{stdout}\n"
+    outputs = split_pyright_output(stdout)
+    return {f: (patterns[f], outputs.get(str(paths[f]), "")) for f in files}
+
+
+@pytest.mark.parametrize("filestr", files)
+def test_typing_file(filestr: str, typing_results: Dict[str, Tuple[str, str]]):
+    file = paths[filestr]
+    pattern, output = typing_results[filestr]
+    assert output, f"pyright {file} succeeded, but should have failed"
     assert re.search(
         pattern, output
     ), f"Typing test failed of {file}\n---\n{pattern}\n---\n{output}\n"